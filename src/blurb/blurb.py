@@ -40,27 +40,25 @@
 # automatic git adds and removes
 
 import atexit
-import base64
 import builtins
+import datetime
+import functools
 import glob
-import hashlib
-import io
 import inspect
-import itertools
 import os
 from pathlib import Path
 import re
-import shlex
 import shutil
-import subprocess
 import sys
-import tempfile
 import textwrap
-import time
 import unittest
 
 from . import __version__
 
+# base64, hashlib, shlex, subprocess and tempfile are only needed
+# by a few subcommands, so they're imported where they are used
+# to keep "blurb help" and "blurb --version" quick to start.
+
 
 #
 # This template is the canonical list of acceptable section names!
@@ -107,6 +105,9 @@ for line in template.split('\n'):
     if found and not prefix:
         sections.append(section.strip())
 
+# for fast membership tests; "sections" keeps the template's order.
+sections_set = frozenset(sections)
+
 
 _sanitize_section = {
     "C API": "C_API",
@@ -136,17 +137,43 @@ _unsanitize_section = {
     }
 
 
+# Every directory name a section may use under Misc/NEWS.d/next,
+# in both the current and the legacy (spaces allowed) spelling.
+sanitized_sections = frozenset(
+    {sanitize_section(section) for section in sections} |
+    {sanitize_section_legacy(section) for section in sections}
+    )
+
+
 def unsanitize_section(section):
     return _unsanitize_section.get(section, section)
 
+# a sanitized section name appearing as a directory within a path
+_unsanitize_section_re = re.compile(
+    r"([/\\])(" + "|".join(re.escape(key) for key in _unsanitize_section) + r")(?=[/\\])")
+
 def next_filename_unsanitize_sections(filename):
-    s = filename
-    for key, value in _unsanitize_section.items():
-        for separator in "/\\":
-            key = f"{separator}{key}{separator}"
-            value = f"{separator}{value}{separator}"
-            filename = filename.replace(key, value)
-    return filename
+    return _unsanitize_section_re.sub(
+        lambda match: match[1] + _unsanitize_section[match[2]], filename)
+
+
+@functools.lru_cache(maxsize=None)
+def text_wrapper(initial_indent, subsequent_indent):
+    """
+    Returns a (shared) TextWrapper configured the way blurb wraps text.
+    """
+    return textwrap.TextWrapper(
+        width=76,
+        initial_indent=initial_indent,
+        subsequent_indent=subsequent_indent,
+        break_long_words=False,
+        break_on_hyphens=False,
+        )
+
+
+# Whitespace textwrap might fold differently on a second pass:
+# runs of whitespace, or anything other than a plain space or newline.
+irregular_whitespace_re = re.compile(r"\s\s|[^\S\n ]")
 
 
 def textwrap_body(body, *, subsequent_indent=''):
@@ -160,34 +187,34 @@ def textwrap_body(body, *, subsequent_indent=''):
     else:
         text = "\n".join(body).rstrip()
 
+    # a single short line with nothing to fold is already wrapped
+    if (not subsequent_indent and len(text) <= 76 and "\n" not in text
+        and text == text.strip() and not irregular_whitespace_re.search(text)):
+        return text + "\n"
+
     # textwrap merges paragraphs, ARGH
 
     # step 1: remove trailing whitespace from individual lines
     #   (this means that empty lines will just have \n, no invisible whitespace)
-    lines = []
-    for line in text.split("\n"):
-        lines.append(line.rstrip())
-    text = "\n".join(lines)
+    text = "\n".join([line.rstrip() for line in text.split("\n")])
     # step 2: break into paragraphs and wrap those
     paragraphs = text.split("\n\n")
     paragraphs2 = []
-    kwargs = {'break_long_words': False, 'break_on_hyphens': False}
-    if subsequent_indent:
-        kwargs['subsequent_indent'] = subsequent_indent
+    initial_indent = ''
     dont_reflow = False
     for paragraph in paragraphs:
+        if not dont_reflow and (not paragraph or paragraph.isspace()):
+            # nothing to reflow
+            paragraphs2.append("")
+            initial_indent = subsequent_indent
+            continue
         # don't reflow bulleted / numbered lists
         dont_reflow = dont_reflow or paragraph.startswith(("* ", "1. ", "#. "))
         if dont_reflow:
-            initial = kwargs.get("initial_indent", "")
-            subsequent = kwargs.get("subsequent_indent", "")
-            if initial or subsequent:
-                lines = [line.rstrip() for line in paragraph.split("\n")]
-                indents = itertools.chain(
-                    itertools.repeat(initial, 1),
-                    itertools.repeat(subsequent),
-                    )
-                lines = [indent + line for indent, line in zip(indents, lines)]
+            if initial_indent or subsequent_indent:
+                first, *rest = [line.rstrip() for line in paragraph.split("\n")]
+                lines = [initial_indent + first]
+                lines.extend(subsequent_indent + line for line in rest)
                 paragraph = "\n".join(lines)
             paragraphs2.append(paragraph)
         else:
@@ -226,13 +253,21 @@ def textwrap_body(body, *, subsequent_indent=''):
             # twice, so it's stable, and this means occasionally it'll
             # convert two spaces to one space, no big deal.
 
-            paragraph = "\n".join(textwrap.wrap(paragraph.strip(), width=76, **kwargs)).rstrip()
-            paragraph = "\n".join(textwrap.wrap(paragraph.strip(), width=76, **kwargs)).rstrip()
+            #
+            # (If the paragraph is only separated by single spaces and
+            # newlines, and there's no indent to fold back in, the second
+            # reflow sees exactly the same words and spaces as the first,
+            # so we can skip it.)
+
+            wrapper = text_wrapper(initial_indent, subsequent_indent)
+            stable = not subsequent_indent and not irregular_whitespace_re.search(paragraph)
+            paragraph = "\n".join(wrapper.wrap(paragraph.strip())).rstrip()
+            if not stable:
+                paragraph = "\n".join(wrapper.wrap(paragraph.strip())).rstrip()
             paragraphs2.append(paragraph)
         # don't reflow literal code blocks (I hope)
         dont_reflow = paragraph.endswith("::")
-        if subsequent_indent:
-            kwargs['initial_indent'] = subsequent_indent
+        initial_indent = subsequent_indent
     text = "\n\n".join(paragraphs2).rstrip()
     if not text.endswith("\n"):
         text += "\n"
@@ -240,10 +275,12 @@ def textwrap_body(body, *, subsequent_indent=''):
 
 
 def current_date():
-    return time.strftime("%Y-%m-%d", time.localtime())
+    now = datetime.datetime.now()
+    return f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
 
 def sortable_datetime():
-    return time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+    now = datetime.datetime.now()
+    return f"{now.year:04d}-{now.month:02d}-{now.day:02d}-{now.hour:02d}-{now.minute:02d}-{now.second:02d}"
 
 
 def prompt(prompt):
@@ -256,60 +293,53 @@ def require_ok(prompt):
         if s == 'ok':
             return s
 
-class pushd:
-    def __init__(self, path):
-        self.path = path
-
-    def __enter__(self):
-        self.previous_cwd = os.getcwd()
-        os.chdir(self.path)
-
-    def __exit__(self, *args):
-        os.chdir(self.previous_cwd)
-
 
 def version_key(element):
-    fields = list(element.split("."))
+    fields = element.split(".")
     if len(fields) == 1:
-        return element
+        # "next" sorts after every numbered version
+        return (1, element)
 
     # in sorted order,
     # 3.5.0a1 < 3.5.0b1 < 3.5.0rc1 < 3.5.0
     # so for sorting purposes we transform
-    # "3.5." and "3.5.0" into "3.5.0zz0"
+    # "3.5." and "3.5.0" into (3, 5, 0, 3, 0)
     last = fields.pop()
-    for s in ("a", "b", "rc"):
+    for stage, s in enumerate(("a", "b", "rc")):
         if s in last:
-            last, stage, stage_version = last.partition(s)
+            last, _, stage_version = last.partition(s)
             break
     else:
-        stage = 'zz'
+        stage = 3
         stage_version = "0"
 
     fields.append(last)
-    while len(fields) < 3:
-        fields.append("0")
-
-    fields.extend([stage, stage_version])
-    fields = [s.rjust(6, "0") for s in fields]
+    fields += ["0"] * (3 - len(fields))
 
-    return ".".join(fields)
+    numbers = [int(s or 0) for s in fields]
+    return (0, *numbers, stage, int(stage_version or 0))
 
 
 def nonceify(body):
-    digest = hashlib.md5(body.encode("utf-8")).digest()
+    import base64
+    import hashlib
+    # six base64 characters only need five bytes of digest
+    digest = hashlib.blake2b(body.encode("utf-8"), digest_size=5).digest()
     return base64.urlsafe_b64encode(digest)[0:6].decode('ascii')
 
 
 def glob_versions():
-    with pushd("Misc/NEWS.d"):
-        versions = []
-        for wildcard in ("2.*.rst", "3.*.rst", "next"):
-            files = [x.partition(".rst")[0] for x in glob.glob(wildcard)]
-            versions.extend(files)
-    xform = [version_key(x) for x in versions]
-    xform.sort(reverse=True)
-    versions = sorted(versions, key=version_key, reverse=True)
+    # one directory read, matching what globbing for
+    # "2.*.rst", "3.*.rst" and "next" used to find
+    versions = []
+    with os.scandir("Misc/NEWS.d") as entries:
+        for entry in entries:
+            name = entry.name
+            if name == "next":
+                versions.append(name)
+            elif name.startswith(("2.", "3.")) and name.endswith(".rst"):
+                versions.append(name.partition(".rst")[0])
+    versions.sort(key=version_key, reverse=True)
     return versions
 
 
@@ -317,20 +347,34 @@ def glob_blurbs(version):
     filenames = []
     base = os.path.join("Misc", "NEWS.d", version)
     if version != "next":
-        wildcard = base + ".rst"
-        filenames.extend(glob.glob(wildcard))
+        filename = base + ".rst"
+        if os.path.exists(filename):
+            filenames.append(filename)
     else:
-        sanitized_sections = (
-                {sanitize_section(section) for section in sections} |
-                {sanitize_section_legacy(section) for section in sections}
-        )
-        for section in sanitized_sections:
-            wildcard = os.path.join(base, section, "*.rst")
-            entries = glob.glob(wildcard)
-            deletables = [x for x in entries if x.endswith("/README.rst")]
-            for filename in deletables:
-                entries.remove(filename)
-            filenames.extend(entries)
+        # scandir gets everything we need from one directory read,
+        # without globbing or stat()ing each entry.  Reading next/
+        # itself first means we only open section directories that
+        # actually exist, rather than trying every spelling of every
+        # section.
+        try:
+            with os.scandir(base) as entries:
+                section_dirs = [entry.path for entry in entries
+                                if entry.name in sanitized_sections and entry.is_dir()]
+        except OSError:
+            section_dirs = []
+        for section_dir in section_dirs:
+            try:
+                entries = os.scandir(section_dir)
+            except OSError:
+                # unreadable section, as glob would ignore
+                continue
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    # glob("*.rst") skipped hidden files, so do we
+                    if (name.endswith(".rst") and name != "README.rst"
+                        and not name.startswith(".")):
+                        filenames.append(os.path.join(section_dir, name))
     filenames.sort(reverse=True, key=next_filename_unsanitize_sections)
     return filenames
 
@@ -429,6 +473,20 @@ blurb in a blurb file.
 
 """
 
+naughty_prefix_re = re.compile(r"- |Issue #|bpo-|gh-|gh-issue-", re.I)
+metadata_re = re.compile(r"\.\.\s*([^:]*?)\s*:\s*(.*)")
+# {date}.gh-issue-{number}.{nonce}.rst, or bpo-{number} for older entries
+next_filename_re = re.compile(
+    r"(?P<date>[^.]+)\.(?:gh-issue-(?P<gh_issue>[^.]+)|bpo-(?P<bpo>[^.]+))\.(?P<nonce>[^.]+)\.rst")
+
+# Blurbs.__str__ writes metadata sorted by name.  Nearly every blurb
+# only uses these names, so keep them presorted rather than sorting
+# each entry's items.
+metadata_order = tuple(sorted(
+    ("bpo", "date", "gh-issue", "no changes", "nonce", "release date", "section")
+    ))
+known_metadata = frozenset(metadata_order)
+
 class Blurbs(list):
 
     def parse(self, text, *, metadata=None, filename="input"):
@@ -456,9 +514,9 @@ class Blurbs(list):
             if not body:
                 throw("Blurb 'body' text must not be empty!")
             text = textwrap_body(body)
-            for naughty_prefix in ("- ", "Issue #", "bpo-", "gh-", "gh-issue-"):
-                if re.match(naughty_prefix, text, re.I):
-                    throw("Blurb 'body' can't start with " + repr(naughty_prefix) + "!")
+            match = naughty_prefix_re.match(text)
+            if match:
+                throw("Blurb 'body' can't start with " + repr(match.group(0)) + "!")
 
             no_changes = metadata.get('no changes')
 
@@ -479,17 +537,17 @@ class Blurbs(list):
                 # better user experience.
                 if key in issue_keys:
                     try:
-                        int(value)
+                        issue_number = int(value)
                     except (TypeError, ValueError):
                         throw(f"Invalid {issue_keys[key]} number: {value!r}")
 
-                if key == "gh-issue" and int(value) < lowest_possible_gh_issue_number:
+                if key == "gh-issue" and issue_number < lowest_possible_gh_issue_number:
                     throw(f"Invalid gh-issue number: {value!r} (must be >= {lowest_possible_gh_issue_number})")
 
                 if key == "section":
                     if no_changes:
                         continue
-                    if value not in sections:
+                    if value not in sections_set:
                         throw(f"Invalid section {value!r}!  You must use one of the predefined sections.")
 
             if "gh-issue" not in metadata and "bpo" not in metadata:
@@ -506,18 +564,20 @@ class Blurbs(list):
         for line_number, line in enumerate(text.split("\n")):
             line = line.rstrip()
             if in_metadata:
+                # blank lines and comments are by far the most common
+                # lines in a metadata block, so test for them first.
+                if not line or line[0] == "#":
+                    continue
                 if line.startswith('..'):
-                    line = line[2:].strip()
-                    name, colon, value = line.partition(":")
-                    assert colon
-                    name = name.lower().strip()
-                    value = value.strip()
+                    match = metadata_re.match(line)
+                    if not match:
+                        throw("Blurb metadata lines must look like '.. name: value'!")
+                    name = match.group(1).lower()
+                    value = match.group(2)
                     if name in metadata:
                         throw("Blurb metadata sets " + repr(name) + " twice!")
                     metadata[name] = value
                     continue
-                if line.startswith("#") or not line:
-                    continue
                 in_metadata = False
 
             if line == "..":
@@ -533,8 +593,11 @@ Read a blurb file.
 
 Broadly equivalent to blurb.parse(open(filename).read()).
         """
-        with open(filename, encoding="utf-8") as file:
-            text = file.read()
+        # decode in one go rather than through a TextIOWrapper;
+        # parse() splits lines itself, so "\r\n" needs no translation.
+        # The file is read whole, so skip the BufferedReader too.
+        with open(filename, "rb", buffering=0) as file:
+            text = file.read().decode("utf-8")
         self.parse(text, metadata=metadata, filename=filename)
 
     def __str__(self):
@@ -547,8 +610,11 @@ Broadly equivalent to blurb.parse(open(filename).read()).
             else:
                 add_separator = True
             if metadata:
-                for name, value in sorted(metadata.items()):
-                    add(f".. {name}: {value}\n")
+                if metadata.keys() <= known_metadata:
+                    items = ((name, metadata[name]) for name in metadata_order if name in metadata)
+                else:
+                    items = sorted(metadata.items())
+                add("".join(f".. {name}: {value}\n" for name, value in items))
                 add("\n")
             add(textwrap_body(body))
         return "".join(output)
@@ -557,9 +623,22 @@ Broadly equivalent to blurb.parse(open(filename).read()).
         dirname = os.path.dirname(path)
         os.makedirs(dirname, exist_ok=True)
 
-        text = str(self)
-        with open(path, "wt", encoding="utf-8") as file:
-            file.write(text)
+        # write to a temporary file and rename it into place,
+        # so an interrupted save never leaves a truncated blurb behind.
+        # Encode up front (with the platform's line endings, as text
+        # mode would) and write the bytes in one go.
+        data = str(self).replace("\n", os.linesep).encode("utf-8")
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
 
     @staticmethod
     def _parse_next_filename(filename):
@@ -570,22 +649,16 @@ Broadly equivalent to blurb.parse(open(filename).read()).
         components = filename.split(os.sep)
         section, filename = components[-2:]
         section = unsanitize_section(section)
-        assert section in sections, f"Unknown section {section}"
-
-        fields = [x.strip() for x in filename.split(".")]
-        assert len(fields) >= 4, f"Can't parse 'next' filename! filename {filename!r} fields {fields}"
-        assert fields[-1] == "rst"
+        assert section in sections_set, f"Unknown section {section}"
 
-        metadata = {"date": fields[0], "nonce": fields[-2], "section": section}
+        match = next_filename_re.fullmatch(filename)
+        assert match, f"Can't parse 'next' filename! filename {filename!r}"
 
-        for field in fields[1:-2]:
-            for name in ("gh-issue", "bpo"):
-                _, got, value = field.partition(name + "-")
-                if got:
-                    metadata[name] = value.strip()
-                    break
-            else:
-                assert False, "Found unparsable field in 'next' filename: " + repr(field)
+        metadata = {"date": match["date"], "nonce": match["nonce"], "section": section}
+        if match["gh_issue"] is not None:
+            metadata["gh-issue"] = match["gh_issue"]
+        else:
+            metadata["bpo"] = match["bpo"]
 
         return metadata
 
@@ -614,15 +687,16 @@ Broadly equivalent to blurb.parse(open(filename).read()).
         """
         self.ensure_metadata()
         metadata, body = self[-1]
-        metadata['section'] = sanitize_section(metadata['section'])
-        metadata['root'] = root
-        if int(metadata["gh-issue"]) > 0:
-            path = "{root}/Misc/NEWS.d/next/{section}/{date}.gh-issue-{gh-issue}.{nonce}.rst".format_map(metadata)
-        elif int(metadata["bpo"]) > 0:
+        section = sanitize_section(metadata.pop('section'))
+        date = metadata.pop('date')
+        nonce = metadata.pop('nonce')
+        gh_issue = metadata.pop('gh-issue')
+        bpo = metadata.pop('bpo')
+        if int(gh_issue) > 0:
+            path = f"{root}/Misc/NEWS.d/next/{section}/{date}.gh-issue-{gh_issue}.{nonce}.rst"
+        elif int(bpo) > 0:
             # assume it's a GH issue number
-            path = "{root}/Misc/NEWS.d/next/{section}/{date}.bpo-{bpo}.{nonce}.rst".format_map(metadata)
-        for name in "root section date gh-issue bpo nonce".split():
-            del metadata[name]
+            path = f"{root}/Misc/NEWS.d/next/{section}/{date}.bpo-{bpo}.{nonce}.rst"
         return path
 
 
@@ -653,15 +727,14 @@ class TestParserPasses(unittest.TestCase):
 
     def test_files(self):
         global tests_run
-        with pushd(self.directory):
-            for filename in glob.glob("*"):
-                if filename[-4:] == '.res':
-                    self.assertTrue(os.path.exists(filename[:-4]), filename)
-                    continue
-                self.filename_test(filename)
-                print(".", end="")
-                sys.stdout.flush()
-                tests_run += 1
+        for filename in glob.glob(os.path.join(self.directory, "*")):
+            if filename[-4:] == '.res':
+                self.assertTrue(os.path.exists(filename[:-4]), filename)
+                continue
+            self.filename_test(filename)
+            print(".", end="")
+            sys.stdout.flush()
+            tests_run += 1
 
 
 class TestParserFailures(TestParserPasses):
@@ -673,7 +746,7 @@ class TestParserFailures(TestParserPasses):
             b.load(filename)
 
 
-readme_re = re.compile(r"This is \w+ version \d+\.\d+").match
+readme_re = re.compile(rb"This is \w+ version \d+\.\d+").match
 
 def chdir_to_repo_root():
     global root
@@ -696,21 +769,24 @@ def chdir_to_repo_root():
         def test_first_line(filename, test):
             if not os.path.exists(filename):
                 return False
-            with open(filename, encoding="utf-8") as file:
-                lines = file.read().split('\n')
-                if not (lines and test(lines[0])):
-                    return False
-            return True
+            # only the first line matters, don't read (or decode)
+            # the whole file
+            with open(filename, "rb") as file:
+                line = file.readline().rstrip(b"\r\n")
+            return test(line)
+
+        # check for the files that must merely exist first,
+        # they're cheaper to test than the ones we have to read.
+        if not os.path.exists("Include/Python.h"):
+            continue
+        if not os.path.exists("Python/ceval.c"):
+            continue
 
         if not (test_first_line("README", readme_re)
             or test_first_line("README.rst", readme_re)):
             continue
 
-        if not test_first_line("LICENSE",  "A. HISTORY OF THE SOFTWARE".__eq__):
-            continue
-        if not os.path.exists("Include/Python.h"):
-            continue
-        if not os.path.exists("Python/ceval.c"):
+        if not test_first_line("LICENSE",  b"A. HISTORY OF THE SOFTWARE".__eq__):
             continue
 
         break
@@ -725,11 +801,14 @@ def error(*a):
 
 
 subcommands = {}
+# subcommand name -> inspect.Signature, computed once at registration
+subcommand_signatures = {}
 
 def subcommand(fn):
     global subcommands
     name = fn.__name__
     subcommands[name] = fn
+    subcommand_signatures[name] = inspect.signature(fn)
     return fn
 
 def get_subcommand(subcommand):
@@ -801,13 +880,13 @@ If subcommand is not specified, prints one-line summaries for every command.
     positionals = []
 
     nesting = 0
-    for name, p in inspect.signature(fn).parameters.items():
+    for name, p in subcommand_signatures[fn.__name__].parameters.items():
         if p.kind == inspect.Parameter.KEYWORD_ONLY:
             short_option = name[0]
             options.append(f" [-{short_option}|--{name}]")
         elif p.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD:
             positionals.append(" ")
-            has_default = (p.default != inspect._empty)
+            has_default = (p.default is not inspect.Parameter.empty)
             if has_default:
                 positionals.append("[")
                 nesting += 1
@@ -891,14 +970,19 @@ def add():
 Add a blurb (a Misc/NEWS.d/next entry) to the current CPython repo.
     """
 
+    import shlex
+    import subprocess
+    import tempfile
+
     editor = find_editor()
 
     handle, tmp_path = tempfile.mkstemp(".rst")
-    os.close(handle)
     atexit.register(lambda : os.unlink(tmp_path))
 
     def init_tmp_with_template():
-        with open(tmp_path, "wt", encoding="utf-8") as file:
+        # write through the descriptor mkstemp already opened for us,
+        # rather than closing it and reopening the file by name.
+        with open(handle, "wt", encoding="utf-8") as file:
             # hack:
             # my editor likes to strip trailing whitespace from lines.
             # normally this is a good idea.  but in the case of the template
@@ -909,9 +993,10 @@ Add a blurb (a Misc/NEWS.d/next entry) to the current CPython repo.
             issue_line = ".. gh-issue:"
             without_space = "\n" + issue_line + "\n"
             with_space = "\n" + issue_line + " \n"
-            if without_space not in text:
+            before, found, after = text.partition(without_space)
+            if not found:
                 sys.exit("Can't find gh-issue line to ensure there's a space on the end!")
-            text = text.replace(without_space, with_space)
+            text = before + with_space + after
             file.write(text)
 
     init_tmp_with_template()
@@ -965,11 +1050,14 @@ Add a blurb (a Misc/NEWS.d/next entry) to the current CPython repo.
 
 
 @subcommand
-def release(version):
+def release(version, *, noverify=False):
     """
 Move all new blurbs to a single blurb file for the release.
 
 This is used by the release manager when cutting a new release.
+
+Afterwards, blurb release reloads the merged file to make sure it
+round-trips.  To skip that check, use -n.
     """
     if version == ".":
         # harvest version number from dirname of repo
@@ -1014,9 +1102,10 @@ This is used by the release manager when cutting a new release.
     flush_git_rm_files()
 
     # sanity check: ensuring that saving/reloading the merged blurb file works.
-    blurbs2 = Blurbs()
-    blurbs2.load(output)
-    assert blurbs2 == blurbs, f"Reloading {output} isn't reproducible?!"
+    if not noverify:
+        blurbs2 = Blurbs()
+        blurbs2.load(output)
+        assert blurbs2 == blurbs, f"Reloading {output} isn't reproducible?!"
 
     print()
     print("Ready for commit.")
@@ -1050,12 +1139,31 @@ To force it to overwrite, use -f.
     write_news(output, versions=versions)
 
 
+def file_matches(path, contents, *, chunk_size=65536):
+    """
+    Returns True if the file at path contains exactly the bytes in contents.
+    If the size differs we know that without reading the file,
+    otherwise it's compared a chunk at a time, stopping at the
+    first difference.
+    """
+    try:
+        if os.path.getsize(path) != len(contents):
+            return False
+        view = memoryview(contents)
+        with open(path, "rb") as file:
+            for offset in range(0, len(contents), chunk_size):
+                if file.read(chunk_size) != view[offset:offset + chunk_size]:
+                    return False
+    except FileNotFoundError:
+        return False
+    return True
+
+
 def write_news(output, *, versions):
-    buff = io.StringIO()
+    lines = []
 
     def print(*a, sep=" "):
-        s = sep.join(str(x) for x in a)
-        return builtins.print(s, file=buff)
+        lines.append(sep.join(str(x) for x in a))
 
     print ("""
 +++++++++++
@@ -1107,49 +1215,71 @@ Python News
                 print(section)
                 print("-" * len(section))
                 print()
+            prefix = "- "
             if metadata.get("gh-issue"):
                 issue_number = metadata['gh-issue']
                 if int(issue_number):
-                    body = "gh-" + issue_number + ": " + body
+                    prefix = f"- gh-{issue_number}: "
             elif metadata.get("bpo"):
                 issue_number = metadata['bpo']
                 if int(issue_number):
-                    body = "bpo-" + issue_number + ": " + body
+                    prefix = f"- bpo-{issue_number}: "
 
-            body = "- " + body
-            text = textwrap_body(body, subsequent_indent='  ')
+            text = textwrap_body(prefix + body, subsequent_indent='  ')
             print(text)
     print()
     print("**(For information about older versions, consult the HISTORY file.)**")
 
 
-    new_contents = buff.getvalue()
+    # Compare as bytes, so the previous file needn't be decoded.
+    # Use the platform's line endings, as writing in text mode would.
+    lines.append("")
+    new_contents = "\n".join(lines).replace("\n", os.linesep).encode("UTF-8")
 
     # Only write in `output` if the contents are different
     # This speeds up subsequent Sphinx builds
-    try:
-        previous_contents = Path(output).read_text(encoding="UTF-8")
-    except (FileNotFoundError, UnicodeError):
-        previous_contents = None
-    if new_contents != previous_contents:
-        Path(output).write_text(new_contents, encoding="UTF-8")
+    if not file_matches(output, new_contents):
+        Path(output).write_bytes(new_contents)
     else:
         builtins.print(output, "is already up to date")
 
 
+def chunk_paths(paths, max_length=30_000):
+    """
+    Split paths into batches short enough to pass on one command line.
+    (Windows caps a command line at 32,767 characters.)
+    """
+    chunk = []
+    length = 0
+    for path in paths:
+        if chunk and length + len(path) + 1 > max_length:
+            yield chunk
+            chunk = []
+            length = 0
+        chunk.append(path)
+        length += len(path) + 1
+    if chunk:
+        yield chunk
+
+
 git_add_files = []
 def flush_git_add_files():
     if git_add_files:
-        subprocess.run(["git", "add", "--force", *git_add_files]).check_returncode()
+        import subprocess
+        # a path queued twice only needs adding once
+        for chunk in chunk_paths(dict.fromkeys(git_add_files)):
+            subprocess.run(["git", "add", "--force", "--", *chunk]).check_returncode()
         git_add_files.clear()
 
 git_rm_files = []
 def flush_git_rm_files():
     if git_rm_files:
-        try:
-            subprocess.run(["git", "rm", "--quiet", "--force", *git_rm_files]).check_returncode()
-        except subprocess.CalledProcessError:
-            pass
+        import subprocess
+        for chunk in chunk_paths(dict.fromkeys(git_rm_files)):
+            try:
+                subprocess.run(["git", "rm", "--quiet", "--force", *chunk]).check_returncode()
+            except subprocess.CalledProcessError:
+                pass
 
         # clean up
         for path in git_rm_files:
@@ -1172,16 +1302,22 @@ def populate():
     """
 Creates and populates the Misc/NEWS.d directory tree.
     """
-    os.chdir("Misc")
-    os.makedirs("NEWS.d/next", exist_ok=True)
-
     for section in sections:
         dir_name = sanitize_section(section)
-        dir_path = f"NEWS.d/next/{dir_name}"
+        dir_path = f"Misc/NEWS.d/next/{dir_name}"
+        # also creates NEWS.d/next itself the first time round
         os.makedirs(dir_path, exist_ok=True)
-        readme_path = f"NEWS.d/next/{dir_name}/README.rst"
-        with open(readme_path, "wt", encoding="utf-8") as readme:
-            readme.write(f"Put news entry ``blurb`` files for the *{section}* section in this directory.\n")
+        readme_path = f"{dir_path}/README.rst"
+        text = f"Put news entry ``blurb`` files for the *{section}* section in this directory.\n"
+        # Use the platform's line endings, as writing in text mode would,
+        # and leave READMEs from a previous run alone.
+        data = text.replace("\n", os.linesep).encode("utf-8")
+        try:
+            unchanged = Path(readme_path).read_bytes() == data
+        except FileNotFoundError:
+            unchanged = False
+        if not unchanged:
+            Path(readme_path).write_bytes(data)
         git_add_files.append(dir_path)
         git_add_files.append(readme_path)
     flush_git_add_files()
@@ -1192,8 +1328,7 @@ def export():
     """
 Removes blurb data files, for building release tarballs/installers.
     """
-    os.chdir("Misc")
-    shutil.rmtree("NEWS.d", ignore_errors=True)
+    shutil.rmtree("Misc/NEWS.d", ignore_errors=True)
 
 
 
@@ -1225,6 +1360,7 @@ def main():
     if fn in (help, test, version):
         sys.exit(fn(*args))
 
+    filtered_args = args
     try:
         original_dir = os.getcwd()
         chdir_to_repo_root()
@@ -1235,7 +1371,7 @@ def main():
         short_options = {}
         long_options = {}
         kwargs = {}
-        for name, p in inspect.signature(fn).parameters.items():
+        for name, p in subcommand_signatures[fn.__name__].parameters.items():
             if p.kind == inspect.Parameter.KEYWORD_ONLY:
                 assert isinstance(p.default, bool), "blurb command-line processing only handles boolean options"
                 kwargs[name] = p.default
@@ -1243,39 +1379,37 @@ def main():
                 long_options[name] = name
 
         filtered_args = []
-        done_with_options = False
-
-        def handle_option(s, dict):
-            name = dict.get(s, None)
-            if not name:
-                sys.exit(f'blurb: Unknown option for {subcommand}: "{s}"')
-            kwargs[name] = not kwargs[name]
 
         # print(f"short_options {short_options} long_options {long_options}")
-        for a in args:
-            if done_with_options:
+        for i, a in enumerate(args):
+            if not a.startswith('-'):
                 filtered_args.append(a)
                 continue
-            if a.startswith('-'):
-                if a == "--":
-                    done_with_options = True
-                elif a.startswith("--"):
-                    handle_option(a[2:], long_options)
-                else:
-                    for s in a[1:]:
-                        handle_option(s, short_options)
-                continue
-            filtered_args.append(a)
-
+            if a == "--":
+                # everything after "--" is positional
+                filtered_args.extend(args[i + 1:])
+                break
+            if a.startswith("--"):
+                options, flags = long_options, (a[2:],)
+            else:
+                options, flags = short_options, a[1:]
+            for s in flags:
+                name = options.get(s)
+                if not name:
+                    sys.exit(f'blurb: Unknown option for {subcommand}: "{s}"')
+                kwargs[name] = not kwargs[name]
 
         sys.exit(fn(*filtered_args, **kwargs))
     except TypeError as e:
         # almost certainly wrong number of arguments.
         # count arguments of function and print appropriate error message.
-        specified = len(args)
+        # options are keyword-only, so count positional arguments only.
+        specified = len(filtered_args)
         required = optional = 0
-        for p in inspect.signature(fn).parameters.values():
-            if p.default == inspect._empty:
+        for p in subcommand_signatures[fn.__name__].parameters.values():
+            if p.kind != inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                continue
+            if p.default is inspect.Parameter.empty:
                 required += 1
             else:
                 optional += 1
@@ -1,3 +1,8 @@
+import os
+import shutil
+import subprocess
+import sys
+
 import pytest
 
 from blurb import blurb
@@ -44,6 +49,28 @@ def test_unsanitize_section_changed(section, expected):
     assert unsanitized == expected
 
 
+@pytest.mark.parametrize(
+    "filename, expected",
+    (
+        (
+            "Misc/NEWS.d/next/Library/2022-04-11-18-34-33.gh-issue-33333.pC7gnM.rst",
+            "Misc/NEWS.d/next/Library/2022-04-11-18-34-33.gh-issue-33333.pC7gnM.rst",
+        ),
+        (
+            "Misc/NEWS.d/next/C_API/2023-03-27-22-09-07.gh-issue-66666.3SN8Bs.rst",
+            "Misc/NEWS.d/next/C API/2023-03-27-22-09-07.gh-issue-66666.3SN8Bs.rst",
+        ),
+        (
+            "Misc\\NEWS.d\\next\\Core_and_Builtins\\2023-03-17-12-09-45.gh-issue-44444.Pf_BI7.rst",
+            "Misc\\NEWS.d\\next\\Core and Builtins\\2023-03-17-12-09-45.gh-issue-44444.Pf_BI7.rst",
+        ),
+    ),
+)
+def test_next_filename_unsanitize_sections(filename, expected):
+    unsanitized = blurb.next_filename_unsanitize_sections(filename)
+    assert unsanitized == expected
+
+
 @pytest.mark.parametrize(
     "version1, version2",
     (
@@ -57,6 +84,8 @@ def test_unsanitize_section_changed(section, expected):
         ("3.7.0rc1", "3.7.0rc2"),
         ("3.7.0rc1", "3.7.0"),
         ("3.8", "3.8.1"),
+        ("3.9.0", "3.10.0a1"),
+        ("3.13.0", "next"),
     ),
 )
 def test_version_key(version1, version2):
@@ -125,6 +154,26 @@ def test_glob_blurbs_next(fs):
     assert set(filenames) == set(fake_news_entries)
 
 
+def test_glob_blurbs_next_unknown_section(fs):
+    # Arrange
+    fs.create_file("Misc/NEWS.d/next/Unknown/2023-03-17-12-09-45.gh-issue-33333.Pf_BI7.rst")
+    fs.create_file("Misc/NEWS.d/next/Library.rst")
+
+    # Act
+    filenames = blurb.glob_blurbs("next")
+
+    # Assert
+    assert filenames == []
+
+
+def test_glob_blurbs_next_missing(fs):
+    # Act
+    filenames = blurb.glob_blurbs("next")
+
+    # Assert
+    assert filenames == []
+
+
 def test_glob_blurbs_sort_order(fs):
     """
     It shouldn't make a difference to sorting whether
@@ -218,6 +267,33 @@ def test_load_next(news_entry, expected_section, fs):
     assert metadata["section"] == expected_section
 
 
+@pytest.mark.parametrize(
+    "news_entry, expected",
+    (
+        (
+            "Misc/NEWS.d/next/Library/2022-04-11-18-34-33.gh-issue-33333.pC7gnM.rst",
+            {"date": "2022-04-11-18-34-33", "nonce": "pC7gnM", "section": "Library", "gh-issue": "33333"},
+        ),
+        (
+            "Misc/NEWS.d/next/C API/2017-12-01-12-34-56.bpo-12345.a-_Bc9.rst",
+            {"date": "2017-12-01-12-34-56", "nonce": "a-_Bc9", "section": "C API", "bpo": "12345"},
+        ),
+    ),
+)
+def test_parse_next_filename(news_entry, expected):
+    # Act
+    metadata = blurb.Blurbs._parse_next_filename(news_entry)
+
+    # Assert
+    assert metadata == expected
+
+
+def test_parse_next_filename_invalid():
+    # Act / Assert
+    with pytest.raises(AssertionError, match="Can't parse 'next' filename!"):
+        blurb.Blurbs._parse_next_filename("Misc/NEWS.d/next/Library/2022-04-11.pC7gnM.rst")
+
+
 @pytest.mark.parametrize(
     "news_entry, expected_path",
     (
@@ -251,6 +327,8 @@ def test_extract_next_filename(news_entry, expected_path, fs):
 
     # Assert
     assert path == expected_path
+    metadata, body = blurbs[-1]
+    assert metadata == {}
 
 
 def test_version(capfd):
@@ -262,6 +340,34 @@ def test_version(capfd):
     assert captured.out.startswith("blurb version ")
 
 
+@pytest.mark.parametrize(
+    "args, how_many",
+    (
+        (["release", "-n"], "0 arguments"),
+        (["release", "a", "b"], "2 arguments"),
+    ),
+)
+def test_main_wrong_number_of_arguments(fs, monkeypatch, capfd, args, how_many):
+    # Arrange
+    fs.create_file("README.rst", contents="This is Python version 3.14.0 alpha 1\n")
+    fs.create_file("LICENSE", contents="A. HISTORY OF THE SOFTWARE\n")
+    fs.create_file("Include/Python.h")
+    fs.create_file("Python/ceval.c")
+    monkeypatch.setattr(sys, "argv", ["blurb", *args])
+
+    # Act
+    with pytest.raises(SystemExit):
+        blurb.main()
+
+    # Assert
+    captured = capfd.readouterr()
+    assert captured.out.startswith(
+        "Error: Wrong number of arguments!\n\n"
+        "blurb release requires 1 argument,\n"
+        f"and you specified {how_many}.\n"
+    )
+
+
 def test_parse():
     # Arrange
     contents = ".. gh-issue: 123456\n.. section: IDLE\nHello world!"
@@ -316,6 +422,10 @@ def test_parse():
             ".. section: IDLE\nHello world!",
             r"'gh-issue:' or 'bpo:' must be specified in the metadata!",
         ),
+        (
+            ".. gh-issue 123456\n.. section: IDLE\nHello world!",
+            r"Blurb metadata lines must look like '.. name: value'!",
+        ),
     ),
 )
 def test_parse_no_body(contents, expected_error):
@@ -325,3 +435,212 @@ def test_parse_no_body(contents, expected_error):
     # Act / Assert
     with pytest.raises(blurb.BlurbError, match=expected_error):
         blurbs.parse(contents)
+
+
+@pytest.mark.parametrize(
+    "contents, expected_error",
+    (
+        ("", r"Error in input:0:\nBlurb 'body' text must not be empty!"),
+        (
+            ".. gh-issue: 123456\n.. section: Library\n",
+            r"Error in input:2:\nBlurb 'body' text must not be empty!",
+        ),
+    ),
+)
+def test_parse_error_line_number(contents, expected_error):
+    # Arrange
+    blurbs = blurb.Blurbs()
+
+    # Act / Assert
+    with pytest.raises(blurb.BlurbError, match=expected_error):
+        blurbs.parse(contents)
+
+
+def test_parse_keeps_unicode_line_separators():
+    # Arrange
+    blurbs = blurb.Blurbs()
+
+    # Act
+    blurbs.parse(".. gh-issue: 123456\n.. section: Library\nFirst\u2028second.\n")
+
+    # Assert
+    metadata, body = blurbs[0]
+    assert body == "First\u2028second.\n"
+
+
+def test_save_round_trip(tmp_path):
+    # Arrange
+    path = str(tmp_path / "Misc" / "NEWS.d" / "3.14.0a1.rst")
+    blurbs = blurb.Blurbs()
+    blurbs.parse(".. gh-issue: 123456\n.. section: IDLE\nHello world!")
+
+    # Act
+    blurbs.save(path)
+
+    # Assert
+    reloaded = blurb.Blurbs()
+    reloaded.load(path)
+    assert reloaded == blurbs
+    assert os.listdir(os.path.dirname(path)) == ["3.14.0a1.rst"]
+
+
+def test_save_recreates_directory(tmp_path):
+    # Arrange
+    path = str(tmp_path / "Misc" / "NEWS.d" / "3.14.0a1.rst")
+    blurbs = blurb.Blurbs()
+    blurbs.parse(".. gh-issue: 123456\n.. section: IDLE\nHello world!")
+    blurbs.save(path)
+    shutil.rmtree(tmp_path / "Misc")
+
+    # Act
+    blurbs.save(path)
+
+    # Assert
+    assert os.path.exists(path)
+
+
+def test_save_failure_removes_tmp_file(tmp_path, monkeypatch):
+    # Arrange
+    path = str(tmp_path / "3.14.0a1.rst")
+    blurbs = blurb.Blurbs()
+    blurbs.parse(".. gh-issue: 123456\n.. section: IDLE\nHello world!")
+
+    def fail(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(os, "replace", fail)
+
+    # Act / Assert
+    with pytest.raises(OSError, match="replace failed"):
+        blurbs.save(path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_write_news(fs, capfd):
+    # Arrange
+    fs.create_file(
+        "Misc/NEWS.d/next/Library/2023-03-17-12-09-45.gh-issue-33333.Pf_BI7.rst",
+        contents="Fixed a thing.",
+    )
+    fs.create_file(
+        "Misc/NEWS.d/3.12.0a1.rst",
+        contents=(
+            ".. gh-issue: 44444\n.. section: Library\n.. release date: 2022-10-25\n"
+            ".. date: 2022-10-01\n.. nonce: abcdef\n\nAdded a thing.\n"
+        ),
+    )
+    versions = blurb.glob_versions()
+
+    # Act
+    blurb.write_news("Misc/NEWS", versions=versions)
+    blurb.write_news("Misc/NEWS", versions=versions)
+
+    # Assert
+    with open("Misc/NEWS", encoding="utf-8") as file:
+        assert file.read() == (
+            "+++++++++++\nPython News\n+++++++++++\n\n"
+            "What's New in Python next?\n==========================\n\n"
+            "*Release date: XXXX-XX-XX*\n\n"
+            "Library\n-------\n\n"
+            "- gh-33333: Fixed a thing.\n\n\n"
+            "What's New in Python 3.12.0 alpha 1?\n====================================\n\n"
+            "*Release date: 2022-10-25*\n\n"
+            "Library\n-------\n\n"
+            "- gh-44444: Added a thing.\n\n\n"
+            "**(For information about older versions, consult the HISTORY file.)**\n"
+        )
+    captured = capfd.readouterr()
+    assert captured.out == "Misc/NEWS is already up to date\n"
+
+
+@pytest.mark.parametrize(
+    "contents, expected",
+    (
+        (b"0123456789", True),
+        (b"0123456789\n", False),
+        (b"0123456x89", False),
+        (b"", False),
+    ),
+)
+def test_file_matches(tmp_path, contents, expected):
+    # Arrange
+    path = tmp_path / "NEWS"
+    path.write_bytes(b"0123456789")
+
+    # Act / Assert
+    assert blurb.file_matches(path, contents, chunk_size=4) is expected
+
+
+def test_file_matches_missing(tmp_path):
+    # Act / Assert
+    assert not blurb.file_matches(tmp_path / "NEWS", b"")
+
+
+def test_chunk_paths():
+    # Arrange
+    paths = [f"Misc/NEWS.d/next/Library/{i:04}.rst" for i in range(100)]
+
+    # Act
+    chunks = list(blurb.chunk_paths(paths, max_length=300))
+
+    # Assert
+    assert [path for chunk in chunks for path in chunk] == paths
+    assert all(sum(len(path) + 1 for path in chunk) <= 300 for chunk in chunks)
+    assert len(chunks) > 1
+
+
+def test_flush_git_add_files(monkeypatch):
+    # Arrange
+    calls = []
+    monkeypatch.setattr("subprocess.run", lambda args: calls.append(args) or subprocess.CompletedProcess(args, 0))
+    blurb.git_add_files.extend(["a.rst", "b.rst", "a.rst"])
+
+    # Act
+    blurb.flush_git_add_files()
+
+    # Assert
+    assert calls == [["git", "add", "--force", "--", "a.rst", "b.rst"]]
+    assert blurb.git_add_files == []
+
+
+def test_populate(fs, monkeypatch):
+    # Arrange
+    monkeypatch.setattr("subprocess.run", lambda args: subprocess.CompletedProcess(args, 0))
+    fs.create_file("Misc/NEWS.d/next/Library/README.rst", contents="stale\n")
+    fs.create_file("Misc/NEWS.d/next/IDLE/README.rst", contents=b"\xff\xfe not UTF-8\n")
+
+    # Act
+    blurb.populate()
+
+    # Assert
+    for section in blurb.sections:
+        readme = f"Misc/NEWS.d/next/{blurb.sanitize_section(section)}/README.rst"
+        with open(readme, encoding="utf-8") as file:
+            assert file.read() == f"Put news entry ``blurb`` files for the *{section}* section in this directory.\n"
+
+
+def test_populate_leaves_up_to_date_readmes_alone(fs, monkeypatch):
+    # Arrange
+    monkeypatch.setattr("subprocess.run", lambda args: subprocess.CompletedProcess(args, 0))
+    blurb.populate()
+    readme = "Misc/NEWS.d/next/Library/README.rst"
+    os.utime(readme, ns=(0, 0))
+
+    # Act
+    blurb.populate()
+
+    # Assert
+    assert os.stat(readme).st_mtime_ns == 0
+
+
+def test_nonceify():
+    # Act
+    nonce = blurb.nonceify("Hello world!")
+
+    # Assert
+    assert len(nonce) == 6
+    assert nonce == blurb.nonceify("Hello world!")
+    assert nonce != blurb.nonceify("Goodbye world!")
+    assert set(nonce) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )